@@ -2,6 +2,10 @@
 """
 Resize screenshots to exact App Store requirements.
 Usage: python3 resize-screenshots.py <input-screenshot.png> [output-dir]
+
+Performance note: LANCZOS resampling dominates runtime here. Installing
+pillow-simd (drop-in Pillow fork, same `from PIL import ...` API) gives ~4x
+faster resizes; see the note in generate-store-assets.py for install steps.
 """
 
 import sys
@@ -40,23 +44,43 @@ def resize_screenshot(input_path, output_dir=None, view_name='screenshot'):
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # LANCZOS cost scales with source area, so for captures larger than the
+    # biggest target, shrink once to a shared intermediate and derive the
+    # outputs from that smaller base instead of re-filtering the full
+    # original each time. Portrait and landscape targets get separate bases:
+    # a base sized for the tallest portrait target is narrower than the
+    # landscape widths, and upscaling from it would re-sample away detail
+    # the original still has.
+    max_portrait_h = max(h for w, h in SCREENSHOT_SIZES.values() if h >= w)
+    max_landscape_w = max(w for w, h in SCREENSHOT_SIZES.values() if w > h)
+    if img.size[1] > max_portrait_h:
+        base_w = round(img.size[0] * max_portrait_h / img.size[1])
+        portrait_base = img.resize((base_w, max_portrait_h), Image.Resampling.LANCZOS)
+    else:
+        portrait_base = img
+    if img.size[0] > max_landscape_w:
+        base_h = round(img.size[1] * max_landscape_w / img.size[0])
+        landscape_base = img.resize((max_landscape_w, base_h), Image.Resampling.LANCZOS)
+    else:
+        landscape_base = img
+
     # Resize to each required size
     success_count = 0
     for size_name, (width, height) in SCREENSHOT_SIZES.items():
         output_path = output_dir / f"{size_name}_{view_name}.png"
-        
+
         try:
             # Resize with high-quality resampling
-            resized = img.resize((width, height), Image.Resampling.LANCZOS)
-            resized.save(output_path, 'PNG', optimize=True)
-            
-            # Verify dimensions
-            verify = Image.open(output_path)
-            if verify.size == (width, height):
-                print(f"✓ Created: {output_path} ({width}x{height})")
-                success_count += 1
-            else:
-                print(f"⚠ Warning: {output_path} has wrong size: {verify.size}")
+            base = portrait_base if height >= width else landscape_base
+            resized = base.resize((width, height), Image.Resampling.LANCZOS)
+            # resize() guarantees the requested dimensions; no need to
+            # re-open and re-decode the PNG from disk just to check them
+            assert resized.size == (width, height)
+            # compress_level=1 instead of optimize=True: optimize runs zlib
+            # twice; one fast pass costs ~10% file size and far less CPU
+            resized.save(output_path, 'PNG', compress_level=1)
+            print(f"✓ Created: {output_path} ({width}x{height})")
+            success_count += 1
         except Exception as e:
             print(f"❌ Error creating {output_path}: {e}")
     